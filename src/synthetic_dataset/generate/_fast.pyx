@@ -0,0 +1,72 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""C fallback for the unconditional-numeric fill loop in dataset_generation.
+
+Used when numba is not installed. Build in place with:
+
+    pip install cython && cythonize -i _fast.pyx
+
+dataset_generation picks this module up automatically when the compiled
+extension is importable.
+"""
+
+from libc.stdlib cimport rand, srand, RAND_MAX
+from libc.math cimport log, sqrt, cos, exp, M_PI
+
+
+cdef inline double _uniform() noexcept nogil:
+    # shifted so we never feed 0 into log()
+    return (rand() + 1.0) / (RAND_MAX + 2.0)
+
+
+cdef inline double _normal() noexcept nogil:
+    # Box-Muller
+    return sqrt(-2.0 * log(_uniform())) * cos(2.0 * M_PI * _uniform())
+
+
+cdef inline double _exponential() noexcept nogil:
+    return -log(_uniform())
+
+
+cdef inline double _poisson(double lam) noexcept nogil:
+    # Knuth's algorithm — fine for the small lambdas in the schema
+    cdef double L = exp(-lam)
+    cdef double p = 1.0
+    cdef long k = 0
+    while True:
+        p *= _uniform()
+        if p <= L:
+            return <double> k
+        k += 1
+
+
+def seed(unsigned int s):
+    srand(s)
+
+
+def fill_numeric(double[:, ::1] out, long long[:] codes, double[:] p0,
+                 double[:] p1, double[:] lo, double[:] hi):
+    """Fill one row of `out` per unconditional numeric field.
+
+    Mirrors the numba kernel: codes select normal/poisson/exponential/
+    lognormal, p0/p1 carry the parameters, lo/hi the clip bounds.
+    """
+    cdef Py_ssize_t f, i
+    cdef long long code
+    cdef double v
+    with nogil:
+        for f in range(out.shape[0]):
+            code = codes[f]
+            for i in range(out.shape[1]):
+                if code == 0:    # normal
+                    v = p0[f] + p1[f] * _normal()
+                elif code == 1:  # poisson
+                    v = _poisson(p0[f])
+                elif code == 2:  # exponential
+                    v = p0[f] * _exponential()
+                else:            # lognormal
+                    v = exp(p0[f] + p1[f] * _normal())
+                if v < lo[f]:
+                    v = lo[f]
+                elif v > hi[f]:
+                    v = hi[f]
+                out[f, i] = v
@@ -1,10 +1,83 @@
+import bisect
 import csv
+import os
 import random
+import shutil
 import uuid
 import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional, get_origin, get_args
+from typing import Any, Dict, List, Literal, Optional, Union, get_origin, get_args
+
+try:
+    from numba import njit, prange, get_num_threads, get_thread_id
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional — the numpy batch path still works
+    HAVE_NUMBA = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAVE_PYARROW = True
+except ImportError:  # pyarrow is optional — pandas.to_csv is the fallback
+    HAVE_PYARROW = False
+
+try:
+    # compiled numeric kernel for environments without numba; build with
+    # `cythonize -i _fast.pyx` (see that file)
+    import _fast
+    HAVE_CYTHON = True
+except ImportError:
+    HAVE_CYTHON = False
+
+
+# distribution codes for the numba kernel
+_D_NORMAL, _D_POISSON, _D_EXPONENTIAL, _D_LOGNORMAL = 0, 1, 2, 3
+
+# annual-income bucket upper bounds for the low/medium/high spend rules
+_INCOME_BUCKET_EDGES = np.array([30_000.0, 60_000.0])
+_INCOME_BUCKET_KEYS = np.array(["low", "medium", "high"], dtype=object)
+
+if HAVE_NUMBA:
+
+    # no cache=True: get_thread_id compiles against dynamic globals
+    @njit(parallel=True)
+    def _seed_numba(s):
+        """Seed numba's per-thread np.random states.
+
+        np.random.seed inside njit only touches the calling thread, so each
+        worker thread seeds its own state (offset by thread id) to make the
+        parallel kernel reproducible.
+        """
+        for _ in prange(get_num_threads()):
+            np.random.seed(s + get_thread_id())
+
+    @njit(parallel=True, cache=True)
+    def _fill_numeric(out, codes, p0, p1, lo, hi):
+        """Fill one row of `out` per unconditional numeric field.
+
+        out is (fields, n); codes/p0/p1/lo/hi hold per-field distribution code,
+        parameters (mean/sd, lambda, scale) and clip bounds (+-inf if unbounded).
+        """
+        for f in range(out.shape[0]):
+            code = codes[f]
+            for i in prange(out.shape[1]):
+                if code == _D_NORMAL:
+                    v = np.random.normal(p0[f], p1[f])
+                elif code == _D_POISSON:
+                    v = float(np.random.poisson(p0[f]))
+                elif code == _D_EXPONENTIAL:
+                    v = np.random.exponential(p0[f])
+                else:
+                    v = np.random.lognormal(p0[f], p1[f])
+                if v < lo[f]:
+                    v = lo[f]
+                elif v > hi[f]:
+                    v = hi[f]
+                out[f, i] = v
 
 
 #TODO:
@@ -13,6 +86,81 @@ from typing import Any, Dict, List, Optional, get_origin, get_args
 #3. append to dataframe
 # 4. save the csv 
 
+# FieldSpec.kind codes — generation dispatches on a small int compare
+# instead of re-inspecting the distribution config
+KIND_FORMULA = 0
+KIND_NORMAL = 1
+KIND_POISSON = 2
+KIND_EXPONENTIAL = 3
+KIND_LOGNORMAL = 4
+KIND_CATEGORICAL = 5
+KIND_BERNOULLI = 6
+KIND_DEFAULT = 7
+
+_KIND_BY_DIST = {
+    "normal": KIND_NORMAL,
+    "poisson": KIND_POISSON,
+    "exponential": KIND_EXPONENTIAL,
+    "lognormal": KIND_LOGNORMAL,
+    "categorical": KIND_CATEGORICAL,
+    "bernoulli": KIND_BERNOULLI,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSpec:
+    """Everything the hot loop needs to know about one field, hoisted out of
+    pydantic introspection at init time."""
+
+    name: str
+    kind: int
+    dist_cfg: Optional[Dict[str, Any]]
+    formula_fn: Optional[Any]
+    deps: tuple
+    default: Any
+
+
+class BatchRNG:
+    """Buffered random-number source for the per-row path.
+
+    Uniform/gaussian/exponential draws are pulled from a shared numpy
+    Generator in blocks and handed out one at a time, so single-row code
+    doesn't pay the np.random.* call overhead on every draw.
+    """
+
+    def __init__(self, rng: np.random.Generator, size: int = 1024):
+        self._rng = rng
+        self._size = size
+        self._u = rng.random(size)
+        self._n = rng.standard_normal(size)
+        self._e = rng.standard_exponential(size)
+        self._ui = self._ni = self._ei = 0
+
+    def uniform(self) -> float:
+        if self._ui == self._size:
+            self._u = self._rng.random(self._size)
+            self._ui = 0
+        val = self._u[self._ui]
+        self._ui += 1
+        return val
+
+    def normal(self) -> float:
+        if self._ni == self._size:
+            self._n = self._rng.standard_normal(self._size)
+            self._ni = 0
+        val = self._n[self._ni]
+        self._ni += 1
+        return val
+
+    def exponential(self) -> float:
+        if self._ei == self._size:
+            self._e = self._rng.standard_exponential(self._size)
+            self._ei = 0
+        val = self._e[self._ei]
+        self._ei += 1
+        return val
+
+
 class DataGenerator:
     """
     Extremely simple automatic data generator that:
@@ -22,8 +170,23 @@ class DataGenerator:
     - Applies distributions and conditional rules
     """
 
-    def __init__(self, model: BaseModel):
+    def __init__(self, model: BaseModel, seed: Optional[int] = None):
         self.model = model
+        self._seed = seed
+        # one Generator for everything instead of mixing random.* and the
+        # legacy np.random.* module functions
+        self._rng = np.random.default_rng(seed)
+        self._brng = BatchRNG(self._rng)
+        if HAVE_CYTHON:
+            # always reseed: libc rand() defaults to srand(1), so unseeded
+            # runs would otherwise all emit identical data (and instances in
+            # one process would continue each other's stream)
+            s = seed if seed is not None else np.random.SeedSequence().generate_state(1)[0]
+            _fast.seed(int(s) & 0xFFFFFFFF)
+        if HAVE_NUMBA and seed is not None:
+            # the numba kernel draws from numba's own np.random states, which
+            # default_rng above does not touch
+            _seed_numba(seed)
         # Support both pydantic v1 and v2 field storages:
         # - v1 exposes `__fields__` mapping to ModelField objects (which have .field_info)
         # - v2 exposes `model_fields` mapping to FieldInfo objects (which have .extra)
@@ -36,177 +199,796 @@ class DataGenerator:
             # fallback: try to treat model as instance
             self.fields = getattr(type(model), "__fields__", getattr(type(model), "model_fields", {}))
 
+        # The dependency DAG and per-field metadata are static once the schema
+        # is loaded — extract them once here instead of re-introspecting
+        # pydantic internals on every row.
+        self._build_plan()
+
+    # -----------------------------
+    #   GENERATION PLAN (built once)
+    # -----------------------------
+    def _build_plan(self):
+        # shared namespace for all formula evaluation; schema imports land here
+        self._formula_globals: Dict[str, Any] = {
+            "uuid": uuid,
+            "math": math,
+            "np": np,
+            "random": random,
+        }
+        self._spec: Dict[str, FieldSpec] = {}
+        self._cat: Dict[str, Dict[Any, tuple]] = {}
+        self._codec: Dict[str, np.ndarray] = {}
+        self._bin_lut: Dict[str, np.ndarray] = {}
+        for name, field in self.fields.items():
+            extras, default_val = self._field_meta(field)
+            deps = extras.get("dependent_on") or []
+            if isinstance(deps, str):
+                deps = [deps]
+            # Only dependencies that are actually fields in the schema matter;
+            # external/missing ones (e.g. signup_date) must not block generation.
+            deps = [d for d in deps if d in self.fields]
+
+            dist_cfg = extras.get("distribution")
+            if dist_cfg:
+                # work on a copy — compiled artifacts (_tables, _bin_lut,
+                # _sampler) must not leak into the schema's own dicts
+                dist_cfg = {**dist_cfg}
+                if dist_cfg.get("dist") == "categorical":
+                    if not dist_cfg.get("categories"):
+                        dist_cfg["categories"] = self._literal_categories(name)
+                    # precompute (keys, cumulative probs) per rule so sampling is
+                    # a single uniform draw + searchsorted instead of random.choices
+                    dist_cfg["_tables"] = self._compile_categorical(dist_cfg)
+                    self._cat[name] = dist_cfg["_tables"]
+                    # batch columns carry small int codes instead of strings;
+                    # _codec holds the code -> category decode array (rule-only
+                    # values, e.g. gender without categories=, are appended)
+                    categories = list(dist_cfg.get("categories") or [])
+                    for keys, _ in dist_cfg["_tables"].values():
+                        for k in keys:
+                            if k not in categories:
+                                categories.append(k)
+                    self._codec[name] = np.array(categories, dtype=object)
+                    code_of = {cat: i for i, cat in enumerate(categories)}
+                    dist_cfg["_code_tables"] = {
+                        key: (np.array([code_of[k] for k in keys], dtype=np.uint8), cum)
+                        for key, (keys, cum) in dist_cfg["_tables"].items()
+                    }
+                if dist_cfg.get("dist") == "bernoulli":
+                    # a boolean parent gates the draw — e.g. a survey can only
+                    # be filled if it was received
+                    gate = next((d for d in deps if self._base_annotation(d) is bool), None)
+                    if gate:
+                        dist_cfg["_gate"] = gate
+                # integer-keyed rules ("18-22", "50") get a value -> rule key
+                # lookup array (per-row) and searchsorted bin edges (batch)
+                # so no range string is parsed at sample time
+                spans = self._int_rule_spans(dist_cfg)
+                if spans:
+                    dist_cfg["_bin_lut"] = self._compile_bin_lut(spans)
+                    dist_cfg["_bin_edges"] = self._compile_bin_edges(spans)
+                    self._bin_lut[name] = dist_cfg["_bin_lut"]
+                dist_cfg["_sampler"] = self._compile_sampler(dist_cfg)
+
+            formula = extras.get("formula")
+            if formula:
+                kind = KIND_FORMULA
+            elif dist_cfg:
+                kind = _KIND_BY_DIST.get(dist_cfg.get("dist"), KIND_DEFAULT)
+            else:
+                kind = KIND_DEFAULT
+
+            self._spec[name] = FieldSpec(
+                name=name,
+                kind=kind,
+                dist_cfg=dist_cfg,
+                formula_fn=self._compile_formula(name, formula) if formula else None,
+                deps=tuple(deps),
+                default=default_val,
+            )
+
+        # conditioning columns arrive as int codes in the batch path, so map
+        # each parent category's code straight to its matched rule key once
+        for spec in self._spec.values():
+            cfg = spec.dist_cfg
+            if cfg and cfg.get("rules") and cfg.get("condition_on") in self._codec:
+                decode = self._codec[cfg["condition_on"]]
+                cfg["_cond_rule_by_code"] = np.array(
+                    [self._match_rule_key(cfg, cat) for cat in decode], dtype=object
+                )
+
+        self._order = self._topo_order()
+        self._specs = [self._spec[name] for name in self._order]
+        self._gens = {name: self._make_gen(self._spec[name]) for name in self._order}
+        self._dtypes = {name: self._dtype_for(name) for name in self._order}
+
+        # default-only fields never change — fill them once into a template
+        # (per-row) / one np.full per column (batch) and keep only the
+        # distribution/formula fields in the hot loop
+        self._static_template = {
+            spec.name: spec.default for spec in self._specs if spec.kind == KIND_DEFAULT
+        }
+        self._dynamic_specs = [spec for spec in self._specs if spec.kind != KIND_DEFAULT]
+        self._build_kernel_plan()
+
+    def _build_kernel_plan(self):
+        """Collect unconditional numeric fields into parameter arrays for the
+        compiled kernel (cython extension if built, else numba). No-op (empty
+        plan) when neither is available."""
+        self._kernel_fields: List[str] = []
+        if not (HAVE_CYTHON or HAVE_NUMBA):
+            return
+
+        kind_to_code = {
+            KIND_NORMAL: _D_NORMAL,
+            KIND_POISSON: _D_POISSON,
+            KIND_EXPONENTIAL: _D_EXPONENTIAL,
+            KIND_LOGNORMAL: _D_LOGNORMAL,
+        }
+        codes, p0s, p1s, los, his = [], [], [], [], []
+        for spec in self._specs:
+            if spec.kind not in kind_to_code:
+                continue
+            cfg = spec.dist_cfg
+            cond = cfg.get("condition_on")
+            if cond and cond in self.fields:
+                continue
+            if spec.kind == KIND_NORMAL:
+                p0, p1 = cfg.get("mean", 0), cfg.get("sd", 1)
+            elif spec.kind == KIND_POISSON:
+                p0, p1 = cfg.get("lambda", 1), 0.0
+            elif spec.kind == KIND_EXPONENTIAL:
+                p0, p1 = cfg.get("scale", 1), 0.0
+            else:
+                p0, p1 = 1.0, 1.0
+            codes.append(kind_to_code[spec.kind])
+            p0s.append(p0)
+            p1s.append(p1)
+            los.append(cfg.get("min", -np.inf))
+            his.append(cfg.get("max", np.inf))
+            self._kernel_fields.append(spec.name)
+
+        self._kernel_codes = np.array(codes, dtype=np.int64)
+        self._kernel_p0 = np.array(p0s, dtype=np.float64)
+        self._kernel_p1 = np.array(p1s, dtype=np.float64)
+        self._kernel_lo = np.array(los, dtype=np.float64)
+        self._kernel_hi = np.array(his, dtype=np.float64)
+
+    def _fill_numeric_batch(self, n: int) -> Dict[str, np.ndarray]:
+        """Run the compiled kernel once for all unconditional numeric fields."""
+        out = np.empty((len(self._kernel_fields), n), dtype=np.float64)
+        if HAVE_CYTHON:
+            _fast.fill_numeric(out, self._kernel_codes, self._kernel_p0,
+                               self._kernel_p1, self._kernel_lo, self._kernel_hi)
+        else:
+            _fill_numeric(out, self._kernel_codes, self._kernel_p0, self._kernel_p1,
+                          self._kernel_lo, self._kernel_hi)
+        cols = {}
+        for f, name in enumerate(self._kernel_fields):
+            arr = out[f]
+            if self._kernel_codes[f] == _D_POISSON:
+                arr = arr.astype(np.int64)
+            cols[name] = arr
+        return cols
+
+    def _topo_order(self) -> List[str]:
+        """Dependency-order the fields with bitmask bookkeeping.
+
+        Each field owns one bit; dep_mask[name] ORs the bits of its in-schema
+        dependencies. A field is ready exactly when
+        unresolved_mask & dep_mask[name] == 0 — one AND over a machine-word
+        bitset instead of per-dependency set lookups. Returns field names in
+        an order where every field comes after the fields it depends on,
+        preserving declaration order where possible.
+        """
+        names = list(self._spec)
+        bit = {name: 1 << i for i, name in enumerate(names)}
+        dep_mask = {
+            name: sum(bit[dep] for dep in spec.deps)
+            for name, spec in self._spec.items()
+        }
+
+        unresolved_mask = (1 << len(names)) - 1
+        order: List[str] = []
+        while unresolved_mask:
+            progressed = False
+            for name in names:
+                if unresolved_mask & bit[name] and not unresolved_mask & dep_mask[name]:
+                    order.append(name)
+                    unresolved_mask &= ~bit[name]
+                    progressed = True
+            if not progressed:
+                blocked = [n for n in names if unresolved_mask & bit[n]]
+                raise RuntimeError(f"Circular dependency detected among fields: {blocked}")
+        return order
+
+    def _make_gen(self, spec: FieldSpec):
+        """Pick the per-row generator for a field once, at init time."""
+        if spec.kind == KIND_FORMULA:
+            return spec.formula_fn
+        if spec.kind == KIND_DEFAULT:
+            default_val = spec.default
+            return lambda obj: default_val
+        return spec.dist_cfg["_sampler"]
+
+    # -----------------------------
+    #   FIELD METADATA HELPERS
+    # -----------------------------
+    def _field_meta(self, field):
+        """Return (extras, default) for a field, normalized across pydantic versions.
+
+        - v1 ModelField keeps extra kwargs in `field_info.extra`
+        - v2 FieldInfo moves them into `json_schema_extra` (older v2 used `.extra`)
+        """
+        if hasattr(field, "field_info"):
+            extras = getattr(field.field_info, "extra", {}) or {}
+        else:
+            extras = getattr(field, "json_schema_extra", None) or getattr(field, "extra", None) or {}
+        default_val = getattr(field, "default", None)
+        # pydantic v2 marks required fields with a PydanticUndefined sentinel
+        if default_val is not None and type(default_val).__name__ == "PydanticUndefinedType":
+            default_val = None
+        return extras, default_val
+
+    def _base_annotation(self, name: str):
+        """Field annotation with any Optional[...] wrapper stripped."""
+        field = self.fields[name]
+        ann = getattr(field, "annotation", None) or getattr(field, "outer_type_", None)
+        if get_origin(ann) is Union:
+            args = [a for a in get_args(ann) if a is not type(None)]
+            if len(args) == 1:
+                ann = args[0]
+        return ann
+
+    def _literal_categories(self, name: str) -> Optional[List[Any]]:
+        """Derive category values from a Literal[...] annotation (unwrapping Optional)."""
+        ann = self._base_annotation(name)
+        if get_origin(ann) is Literal:
+            return list(get_args(ann))
+        return None
+
+    def _dtype_for(self, name: str) -> np.dtype:
+        """Native column dtype for a field; object only for strings and
+        all-None default columns."""
+        spec = self._spec[name]
+        if spec.kind == KIND_CATEGORICAL:
+            # batch columns hold category codes; labels come back at CSV write
+            return np.dtype(np.uint8) if name in self._codec else np.dtype(object)
+        if spec.kind == KIND_FORMULA:
+            return np.dtype(object)
+        if spec.kind == KIND_DEFAULT and spec.default is None:
+            return np.dtype(object)
+        ann = self._base_annotation(name)
+        if ann is bool:
+            return np.dtype(bool)
+        if ann is int:
+            return np.dtype(np.int32)
+        if ann is float:
+            return np.dtype(np.float64)
+        return np.dtype(object)
+
+    def _compile_categorical(self, dist_cfg: Dict[str, Any]) -> Dict[Any, tuple]:
+        """Build (keys array, cumulative probs) per rule key for a categorical field.
+
+        The None key holds the uniform-over-categories fallback used when the
+        field is unconditional or no rule matches.
+        """
+        tables: Dict[Any, tuple] = {}
+        for key, rule in (dist_cfg.get("rules") or {}).items():
+            probs = rule["probs"]
+            keys = np.array(list(probs.keys()), dtype=object)
+            cum = np.cumsum(np.array(list(probs.values()), dtype=float))
+            cum[-1] = max(cum[-1], 1.0)  # guard against fp drift in the prob sum
+            tables[key] = (keys, cum)
+
+        categories = dist_cfg.get("categories")
+        if categories:
+            keys = np.array(categories, dtype=object)
+            tables[None] = (keys, np.linspace(1 / len(categories), 1.0, len(categories)))
+        return tables
+
+    def _int_rule_spans(self, dist_cfg: Dict[str, Any]) -> Optional[List[tuple]]:
+        """Parse integer-keyed rules into (lo, hi, key) spans.
+
+        Returns None when the rules are keyed by something other than integer
+        ranges / exact integers (e.g. education level names).
+        """
+        spans = []
+        for key in dist_cfg.get("rules") or {}:
+            if key == "default":
+                continue
+            if "-" in key:
+                lo, hi = key.split("-")
+            elif key.isdigit():
+                lo = hi = key
+            else:
+                return None
+            spans.append((int(lo), int(hi), key))
+        return spans or None
+
+    def _compile_bin_lut(self, spans: List[tuple]) -> np.ndarray:
+        """Dense value -> rule key lookup array for the per-row path."""
+        lut = np.full(max(hi for _, hi, _ in spans) + 1, None, dtype=object)
+        for lo, hi, key in spans:
+            lut[lo:hi + 1] = key
+        return lut
+
+    def _compile_bin_edges(self, spans: List[tuple]) -> tuple:
+        """(edges, keys) arrays for batch rule matching via np.searchsorted.
+
+        edges[i] is the inclusive upper bound of bin i and keys[i] its rule
+        key; gaps and the overflow bin carry None (-> default rule).
+        """
+        edges: List[float] = []
+        keys: List[Optional[str]] = []
+        prev_hi: Optional[int] = None
+        for lo, hi, key in sorted(spans):
+            if (prev_hi is None and lo > 0) or (prev_hi is not None and lo > prev_hi + 1):
+                edges.append(lo - 1)
+                keys.append(None)
+            edges.append(hi)
+            keys.append(key)
+            prev_hi = hi
+        keys.append(None)  # overflow bin above the last edge
+        return np.array(edges, dtype=np.float64), np.array(keys, dtype=object)
+
+    def _match_rule_key(self, dist_cfg: Dict[str, Any], cond_val: Any) -> Optional[str]:
+        """Find the rule key matching a conditioning value ("18-22" ranges,
+        exact values, or zero/positive parent checks)."""
+        rules = dist_cfg.get("rules") or {}
+        if set(rules) - {"default"} == {"zero", "positive"}:
+            return "positive" if cond_val else "zero"
+        if set(rules) - {"default"} == {"low", "medium", "high"}:
+            return _INCOME_BUCKET_KEYS[bisect.bisect_right(_INCOME_BUCKET_EDGES, cond_val)]
+
+        lut = dist_cfg.get("_bin_lut")
+        if lut is not None:
+            iv = int(cond_val)
+            key = lut[iv] if 0 <= iv < len(lut) else None
+            if key is not None:
+                return key
+            return "default" if "default" in dist_cfg.get("rules", {}) else None
+
+        for key in dist_cfg.get("rules", {}):
+            if key == "default":
+                continue
+            if "-" in key:
+                lo, hi = key.split("-")
+                if int(lo) <= int(cond_val) <= int(hi):
+                    return key
+            elif str(cond_val) == key:
+                return key
+        return "default" if "default" in dist_cfg.get("rules", {}) else None
+
+    # Well-known formula expressions mapped to direct callables — calling a
+    # plain Python function beats eval'ing even a precompiled code object.
+    _KNOWN_FORMULAS = {
+        "uuid.uuid4().hex": lambda ctx: uuid.uuid4().hex,
+    }
+
+    def _compile_formula(self, name: str, formula: str):
+        """Turn a schema formula like "import uuid; uuid.uuid4().hex" into a callable.
+
+        Leading statements (imports) are exec'd once into the shared formula
+        globals; the trailing expression is either matched against the
+        registry of known formulas or compiled once to a code object.
+        Re-parsing and re-importing per row is what made eval(formula) slow.
+        """
+        *statements, expression = formula.split(";")
+        expression = expression.strip()
+        for stmt in statements:
+            exec(stmt.strip(), self._formula_globals)
+
+        known = self._KNOWN_FORMULAS.get(expression)
+        if known is not None:
+            return known
+
+        code = compile(expression, f"<{name}>", "eval")
+        return lambda ctx: eval(code, self._formula_globals, ctx)
+
     # -----------------------------
     #   DISTRIBUTION SAMPLERS
     # -----------------------------
+    def _active_rule(self, dist_cfg: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Parameter overrides from the rule matching the conditioning value."""
+        cond = dist_cfg.get("condition_on")
+        if not (cond and cond in context and dist_cfg.get("rules")):
+            return {}
+        return dist_cfg["rules"].get(self._match_rule_key(dist_cfg, context[cond])) or {}
+
     def sample_distribution(self, dist_cfg: Dict[str, Any], context: Dict[str, Any]):
+        """Legacy entry point — plan configs carry their compiled sampler,
+        ad-hoc configs get compiled on the spot."""
         if dist_cfg is None:
             return None
+        sampler = dist_cfg.get("_sampler")
+        if sampler is None:
+            sampler = self._compile_sampler(dist_cfg)
+        return sampler(context)
+
+    def _compile_sampler(self, dist_cfg: Dict[str, Any]):
+        """Specialize a distribution config into a sampler(ctx) closure.
 
+        All config inspection happens here, once per field; the closures only
+        touch locals and, for conditioned fields, the matched rule.
+        """
         dist = dist_cfg.get("dist")
+        cond = dist_cfg.get("condition_on")
+        conditioned = bool(cond and dist_cfg.get("rules"))
+        brng = self._brng
+        rng = self._rng
 
         if dist == "normal":
-            mean = dist_cfg.get("mean", 0)
-            sd = dist_cfg.get("sd", 1)
-            val = np.random.normal(mean, sd)
-
-            # Respect optional min/max if included
-            if "min" in dist_cfg:
-                val = max(val, dist_cfg["min"])
-            if "max" in dist_cfg:
-                val = min(val, dist_cfg["max"])
-            return val
+            mean0 = dist_cfg.get("mean", 0)
+            sd0 = dist_cfg.get("sd", 1)
+            lo = dist_cfg.get("min", -math.inf)
+            hi = dist_cfg.get("max", math.inf)
+            if conditioned:
+                def sampler(ctx):
+                    rule = self._active_rule(dist_cfg, ctx)
+                    val = rule.get("mean", mean0) + rule.get("sd", sd0) * brng.normal()
+                    return min(max(val, lo), hi)
+            else:
+                def sampler(ctx):
+                    return min(max(mean0 + sd0 * brng.normal(), lo), hi)
+            return sampler
 
         if dist == "lognormal":
-            return float(np.random.lognormal(mean=1, sigma=1))
+            if conditioned:
+                # rule semantics: scale_factor = noisy fraction of the parent,
+                # multiplier / fraction_of_total = deterministic share of it
+                def sampler(ctx):
+                    rule = self._active_rule(dist_cfg, ctx)
+                    parent = ctx.get(cond) or 0
+                    if "scale_factor" in rule:
+                        return float(parent * rule["scale_factor"] * math.exp(brng.normal()))
+                    if "fraction_of_total" in rule:
+                        return float(parent * rule["fraction_of_total"])
+                    if "multiplier" in rule:
+                        return float(parent * rule["multiplier"])
+                    return float(math.exp(1 + brng.normal()))
+                return sampler
+            return lambda ctx: float(math.exp(1 + brng.normal()))
 
         if dist == "poisson":
-            lam = dist_cfg.get("lambda", 1)
-            return int(np.random.poisson(lam))
+            lam0 = dist_cfg.get("lambda", 1)
+            if conditioned:
+                def sampler(ctx):
+                    rule = self._active_rule(dist_cfg, ctx)
+                    if "factor" in rule:
+                        lam = ctx[cond] * rule["factor"]
+                    else:
+                        lam = rule.get("lambda", lam0)
+                    return int(rng.poisson(lam))
+            else:
+                def sampler(ctx):
+                    return int(rng.poisson(lam0))
+            return sampler
 
         if dist == "exponential":
-            scale = dist_cfg.get("scale", 1)
-            return float(np.random.exponential(scale))
+            scale0 = dist_cfg.get("scale", 1)
+            if conditioned:
+                def sampler(ctx):
+                    scale = self._active_rule(dist_cfg, ctx).get("scale", scale0)
+                    return float(scale * brng.exponential())
+            else:
+                def sampler(ctx):
+                    return float(scale0 * brng.exponential())
+            return sampler
 
         if dist == "categorical":
-            categories = dist_cfg.get("categories")
-            rules = dist_cfg.get("rules", {})
-            cond = dist_cfg.get("condition_on")
-
-            if cond and cond in context:
-                cond_val = context[cond]
-                # find rule key for ranges (e.g. "18-22")
-                for key, rule in rules.items():
-                    if key == "default":
-                        continue
-                    if "-" in key:
-                        lo, hi = key.split("-")
-                        if int(lo) <= int(cond_val) <= int(hi):
-                            probs = rule["probs"]
-                            return random.choices(list(probs.keys()), list(probs.values()))[0]
-                    else:
-                        if str(cond_val) == key:
-                            probs = rule["probs"]
-                            return random.choices(list(probs.keys()), list(probs.values()))[0]
-
-                # fallback
-                if "default" in rules:
-                    probs = rules["default"]["probs"]
-                    return random.choices(list(probs.keys()), list(probs.values()))[0]
-
-            # unconditional categorical
-            return random.choice(categories)
+            tables = dist_cfg.get("_tables")
+            if tables is None:
+                tables = self._compile_categorical(dist_cfg)
+            if cond:
+                def sampler(ctx):
+                    key = self._match_rule_key(dist_cfg, ctx[cond]) if cond in ctx else None
+                    keys, cum = tables.get(key) or tables[None]
+                    return keys[bisect.bisect_left(cum, brng.uniform())]
+            else:
+                keys, cum = tables[None]
+
+                def sampler(ctx):
+                    return keys[bisect.bisect_left(cum, brng.uniform())]
+            return sampler
 
         if dist == "bernoulli":
             p = dist_cfg.get("p", 0.5)
-            return random.random() < p
+            gate = dist_cfg.get("_gate")
+            if gate:
+                return lambda ctx: bool(ctx.get(gate)) and bool(brng.uniform() < p)
+            return lambda ctx: bool(brng.uniform() < p)
 
-        return None
+        return lambda ctx: None
 
     # -----------------------------
     #   MAIN GENERATION FUNCTION
     # -----------------------------
     def generate_one(self) -> Dict[str, Any]:
-        obj = {}
-        unresolved = set(self.fields.keys())
+        # Fields are visited in the precomputed topological order, so every
+        # dependency is already in `obj` by the time it is needed. Static
+        # defaults are copied in from the template up front.
+        obj = dict(self._static_template)
+        gens = self._gens
+        for spec in self._dynamic_specs:
+            obj[spec.name] = gens[spec.name](obj)
+        return obj
 
-        # Resolve values in dependency order
-        while unresolved:
-            progress = False
+    # -----------------------------
+    #   BATCH (VECTORIZED) SAMPLERS
+    # -----------------------------
+    # One numpy call per field instead of one per row: the per-row loop is
+    # dominated by Python dispatch overhead, not by the RNG math itself.
+    def _sample_normal_batch(self, cfg: Dict[str, Any], n: int) -> np.ndarray:
+        arr = self._rng.normal(cfg.get("mean", 0), cfg.get("sd", 1), n)
+        if "min" in cfg or "max" in cfg:
+            arr = np.clip(arr, cfg.get("min"), cfg.get("max"))
+        return arr
+
+    def _sample_poisson_batch(self, cfg: Dict[str, Any], n: int) -> np.ndarray:
+        return self._rng.poisson(cfg.get("lambda", 1), n)
+
+    def _sample_exponential_batch(self, cfg: Dict[str, Any], n: int) -> np.ndarray:
+        return self._rng.exponential(cfg.get("scale", 1), n)
+
+    def _sample_lognormal_batch(self, cfg: Dict[str, Any], n: int) -> np.ndarray:
+        return self._rng.lognormal(mean=1, sigma=1, size=n)
+
+    _BATCH_SAMPLERS = {
+        "normal": _sample_normal_batch,
+        "poisson": _sample_poisson_batch,
+        "exponential": _sample_exponential_batch,
+        "lognormal": _sample_lognormal_batch,
+    }
+
+    def generate_columns(self, n: int) -> Dict[str, Any]:
+        """Generate n rows column-wise: one array per field, in dependency order.
+
+        Categorical columns are returned as uint8 category codes (decode
+        arrays live in self._codec); everything downstream of generation
+        compares small ints instead of strings.
+        """
+        cols: Dict[str, Any] = {}
+        for name, default in self._static_template.items():
+            cols[name] = np.full(n, default, dtype=self._dtypes[name])
+
+        # unconditional numeric fields come out of the numba kernel in one shot
+        precomputed = self._fill_numeric_batch(n) if self._kernel_fields else {}
+        for spec in self._dynamic_specs:
+            dtype = self._dtypes[spec.name]
+            if spec.name in precomputed:
+                arr = precomputed[spec.name]
+            elif spec.kind == KIND_FORMULA:
+                fn = spec.formula_fn
+                arr = np.array([fn({}) for _ in range(n)], dtype=object)
+            else:
+                arr = self._sample_column(spec.name, spec.dist_cfg, cols, n)
+            # keep columns in native dtypes (Struct-of-Arrays) — boxed Python
+            # objects only where unavoidable
+            if dtype != object:
+                arr = np.asarray(arr).astype(dtype, copy=False)
+            elif not isinstance(arr, np.ndarray):
+                arr = np.array(arr, dtype=object)
+            cols[spec.name] = arr
+
+        # restore the schema's topological column order for the CSV header
+        return {name: cols[name] for name in self._order}
+
+    def _sample_column(self, name: str, dist_cfg: Dict[str, Any], cols: Dict[str, Any], n: int):
+        dist = dist_cfg.get("dist")
+        cond = dist_cfg.get("condition_on")
 
-            for name in list(unresolved):
-                field = self.fields[name]
+        # fully vectorized fast path for unconditional numeric distributions
+        if dist in self._BATCH_SAMPLERS and not (cond and cond in cols):
+            return self._BATCH_SAMPLERS[dist](self, dist_cfg, n)
 
-                # Normalize access to extra metadata and default across pydantic versions
-                if hasattr(field, "field_info"):
-                    # pydantic v1: ModelField
-                    extras = getattr(field.field_info, "extra", {}) or {}
-                    default_val = getattr(field, "default", None)
-                else:
-                    # pydantic v2: FieldInfo
-                    extras = getattr(field, "extra", {}) or {}
-                    default_val = getattr(field, "default", None)
-
-                dist_cfg = extras.get("distribution")
-                formula = extras.get("formula")
-                deps = extras.get("dependent_on")
-
-                # dependencies not resolved yet
-                if deps:
-                    if isinstance(deps, str):
-                        deps = [deps]
-                    # Only consider dependencies that are actually fields in the schema.
-                    # If a dependency refers to an external or missing field (e.g. signup_date),
-                    # don't block generation on it.
-                    relevant_deps = [d for d in deps if d in self.fields]
-                    if any(dep not in obj for dep in relevant_deps):
-                        continue
-
-                # -----------------------------
-                # 1. formula-based generator
-                # -----------------------------
-                if formula:
-                    obj[name] = eval(formula)
-                    unresolved.remove(name)
-                    progress = True
-                    continue
-
-                # -----------------------------
-                # 2. literal type handling (bool, int, float, str)
-                # -----------------------------
-                if dist_cfg:
-                    val = self.sample_distribution(dist_cfg, obj)
-                    obj[name] = val
-                    unresolved.remove(name)
-                    progress = True
-                    continue
-
-                # -----------------------------
-                # 3. default if nothing else applies
-                # -----------------------------
-                # If a default value was provided (including explicit None) or
-                # the field has no distribution/formula and no relevant deps,
-                # treat it as resolved by assigning the default (may be None).
-                has_explicit_default = (default_val is not None) or (
-                    hasattr(field, "required") and not getattr(field, "required")
-                )
-                if has_explicit_default or (not dist_cfg and not formula and not deps):
-                    obj[name] = default_val
-                    unresolved.remove(name)
-                    progress = True
-                    continue
-
-            if not progress:
-                # prevent endless loop — provide debug info to help identify blocked fields
-                print("No progress in generation loop. Unresolved fields:", unresolved)
-                for name in unresolved:
-                    f = self.fields[name]
-                    if hasattr(f, "field_info"):
-                        ex = getattr(f.field_info, "extra", {}) or {}
-                        dval = getattr(f, "default", None)
-                    else:
-                        ex = getattr(f, "extra", {}) or {}
-                        dval = getattr(f, "default", None)
-                    deps_here = ex.get("dependent_on")
-                    print(name, "-> has_distribution=", bool(ex.get("distribution")), "formula=", ex.get("formula"), "default=", dval, "dependent_on=", deps_here)
-                raise RuntimeError("Circular dependency or unresolved field detected.")
+        if dist == "categorical":
+            return self._sample_categorical_batch(name, dist_cfg, cols, n)
 
-        return obj
+        if dist in ("normal", "exponential", "poisson") and cond in cols and dist_cfg.get("rules"):
+            return self._sample_rules_batch(dist, dist_cfg, cols[cond], n)
+
+        if dist == "bernoulli":
+            return self._sample_bernoulli_batch(dist_cfg, cols, n)
+
+        if dist == "lognormal" and cond in cols and dist_cfg.get("rules"):
+            return self._sample_lognormal_rules_batch(dist_cfg, cols[cond], n)
+
+        # anything else: per-row fallback over the batch
+        if cond and cond in cols:
+            cond_col = cols[cond]
+            return [self.sample_distribution(dist_cfg, {cond: cond_col[i]}) for i in range(n)]
+        return [self.sample_distribution(dist_cfg, {}) for _ in range(n)]
+
+    def _sample_lognormal_rules_batch(self, dist_cfg: Dict[str, Any], cond_col, n: int) -> np.ndarray:
+        """Conditional lognormal: the parent column is bucketed (low/medium/
+        high income or zero/positive) and each group resolved in one pass.
+
+        scale_factor rules give a noisy fraction of the parent value;
+        multiplier / fraction_of_total rules a deterministic share of it.
+        """
+        rules = dist_cfg.get("rules") or {}
+        cond_arr = np.asarray(cond_col, dtype=np.float64)
+        rule_keys = self._rule_keys_batch(dist_cfg, cond_col, n)
+        out = np.empty(n, dtype=np.float64)
+
+        for key in set(rule_keys.tolist()):
+            idx = np.nonzero(rule_keys == key)[0]
+            rule = rules.get(key) or {}
+            if "scale_factor" in rule:
+                out[idx] = cond_arr[idx] * rule["scale_factor"] * self._rng.lognormal(0, 1, len(idx))
+            elif "fraction_of_total" in rule:
+                out[idx] = cond_arr[idx] * rule["fraction_of_total"]
+            elif "multiplier" in rule:
+                out[idx] = cond_arr[idx] * rule["multiplier"]
+            else:
+                out[idx] = self._rng.lognormal(1, 1, len(idx))
+        return out
+
+    def _rule_keys_batch(self, dist_cfg: Dict[str, Any], cond_col, n: int) -> np.ndarray:
+        """Matched rule key per row for a whole conditioning column."""
+        rules = dist_cfg.get("rules") or {}
+        cond_arr = np.asarray(cond_col)
+
+        # categorical parents come in as int codes — one fancy-index resolves
+        # the whole column against the precomputed code -> rule key map
+        by_code = dist_cfg.get("_cond_rule_by_code")
+        if by_code is not None and cond_arr.dtype.kind in "iu":
+            return by_code[cond_arr]
+
+        if set(rules) - {"default"} == {"zero", "positive"}:
+            return np.where(cond_arr.astype(bool), "positive", "zero").astype(object)
+
+        if set(rules) - {"default"} == {"low", "medium", "high"}:
+            return _INCOME_BUCKET_KEYS[
+                np.digitize(cond_arr.astype(np.float64), _INCOME_BUCKET_EDGES)
+            ]
+
+        bin_edges = dist_cfg.get("_bin_edges")
+        if bin_edges is not None:
+            edges, keys = bin_edges
+            rule_keys = keys[np.searchsorted(edges, cond_arr.astype(np.float64))]
+            if "default" in rules:
+                rule_keys[np.equal(rule_keys, None)] = "default"
+            return rule_keys
+
+        return np.array([self._match_rule_key(dist_cfg, v) for v in cond_arr], dtype=object)
+
+    def _sample_rules_batch(self, dist: str, dist_cfg: Dict[str, Any], cond_col, n: int) -> np.ndarray:
+        """Conditional normal/exponential/poisson over the batch: rows are
+        grouped by matched rule and each group is drawn with one RNG call."""
+        rules = dist_cfg.get("rules") or {}
+        cond_arr = np.asarray(cond_col)
+        rule_keys = self._rule_keys_batch(dist_cfg, cond_col, n)
+        out = np.empty(n, dtype=np.float64)
+
+        for key in set(rule_keys.tolist()):
+            idx = np.nonzero(rule_keys == key)[0]
+            rule = rules.get(key) or {}
+            if dist == "normal":
+                mean = rule.get("mean", dist_cfg.get("mean", 0))
+                sd = rule.get("sd", dist_cfg.get("sd", 1))
+                out[idx] = mean + sd * self._rng.standard_normal(len(idx))
+            elif dist == "exponential":
+                scale = rule.get("scale", dist_cfg.get("scale", 1))
+                out[idx] = self._rng.exponential(scale, len(idx))
+            else:  # poisson — lambda may scale with the parent value
+                if "factor" in rule:
+                    lam = cond_arr[idx].astype(np.float64) * rule["factor"]
+                else:
+                    lam = rule.get("lambda", dist_cfg.get("lambda", 1))
+                out[idx] = self._rng.poisson(lam, len(idx))
+
+        if dist == "normal" and ("min" in dist_cfg or "max" in dist_cfg):
+            out = np.clip(out, dist_cfg.get("min"), dist_cfg.get("max"))
+        return out
+
+    def _sample_bernoulli_batch(self, dist_cfg: Dict[str, Any], cols: Dict[str, Any], n: int) -> np.ndarray:
+        """Branchless bernoulli: one comparison over the batch, AND'd with the
+        boolean parent column when the field is gated."""
+        out = self._rng.random(n) < dist_cfg.get("p", 0.5)
+        gate = dist_cfg.get("_gate")
+        if gate and gate in cols:
+            out &= np.asarray(cols[gate]).astype(bool)
+        return out
+
+    def _sample_categorical_batch(self, name: str, dist_cfg: Dict[str, Any], cols: Dict[str, Any], n: int):
+        """Inverse-CDF categorical sampling over the whole batch.
+
+        Rows are grouped by their matched rule key so each group needs one
+        uniform batch + one searchsorted instead of n random.choices calls.
+        Returns uint8 category codes; self._codec[name] decodes them.
+        """
+        tables = dist_cfg["_code_tables"]
+        cond = dist_cfg.get("condition_on")
+
+        if not (cond and cond in cols):
+            codes, cum = tables[None]
+            return codes[np.searchsorted(cum, self._rng.random(n))]
+
+        rule_keys = self._rule_keys_batch(dist_cfg, cols[cond], n)
+        out = np.empty(n, dtype=np.uint8)
+        for key in set(rule_keys.tolist()):
+            idx = np.nonzero(rule_keys == key)[0]
+            codes, cum = tables.get(key) or tables[None]
+            out[idx] = codes[np.searchsorted(cum, self._rng.random(len(idx)))]
+        return out
 
     # -----------------------------
     #   GENERATE MANY + SAVE CSV
     # -----------------------------
-    def generate(self, n: int, csv_path: str):
-        rows = [self.generate_one() for _ in range(n)]
-        fieldnames = list(rows[0].keys())
-
-        with open(csv_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
-
+    def generate(self, n: int, csv_path: str, vectorized: bool = True,
+                 workers: Optional[int] = 1):
+        """Generate n rows and write them to csv_path.
+
+        The default vectorized path builds columns and streams them out in
+        chunks. vectorized=False generates row by row and writes each row as
+        it is produced, keeping peak memory at O(fields) instead of O(n).
+
+        Rows are independent, so workers > 1 (None = one per CPU) splits n
+        across a process pool; each worker writes its own shard with an
+        independently seeded generator and the shards are concatenated.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or n < workers:
+            self._write_csv(n, csv_path, vectorized)
+        else:
+            self._generate_parallel(n, csv_path, vectorized, workers)
         print(f"Generated {n} rows → {csv_path}")
 
+    def _write_csv(self, n: int, csv_path: str, vectorized: bool):
+        if vectorized:
+            cols = self.generate_columns(n)
+            # categorical columns carry int codes internally; decode to labels
+            # only here, at the output boundary
+            for name, decode in self._codec.items():
+                cols[name] = decode[cols[name]]
+            if HAVE_PYARROW:
+                # arrow's CSV writer walks the typed columns in C and is
+                # multithreaded; the write becomes output-bandwidth bound
+                pa_csv.write_csv(pa.Table.from_pydict(cols), csv_path)
+            else:
+                pd.DataFrame(cols).to_csv(csv_path, index=False, chunksize=100_000)
+        else:
+            fieldnames = list(self._order)
+            with open(csv_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                for _ in range(n):
+                    row = self.generate_one()
+                    writer.writerow([row[k] for k in fieldnames])
+
+    def _generate_parallel(self, n: int, csv_path: str, vectorized: bool, workers: int):
+        # spawn gives statistically independent per-worker streams that are
+        # still derived from the constructor seed (fresh entropy when None)
+        seeds = [int(s.generate_state(1)[0])
+                 for s in np.random.SeedSequence(self._seed).spawn(workers)]
+        chunk = n // workers
+        sizes = [chunk + (1 if i < n % workers else 0) for i in range(workers)]
+        shards = [f"{csv_path}.part{i}" for i in range(workers)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_generate_shard,
+                          [self.model] * workers, sizes, seeds, shards,
+                          [vectorized] * workers))
+
+        # concatenate shards, keeping only the first header
+        with open(csv_path, "wb") as out:
+            for i, shard in enumerate(shards):
+                with open(shard, "rb") as f:
+                    if i:
+                        f.readline()
+                    shutil.copyfileobj(f, out)
+                os.remove(shard)
+
+
+def _generate_shard(model, n: int, seed: int, shard_path: str, vectorized: bool) -> str:
+    """Worker for the process pool — module-level so it pickles cleanly."""
+    DataGenerator(model, seed=seed)._write_csv(n, shard_path, vectorized)
+    return shard_path
+
 
 # -----------------------------
 # USAGE EXAMPLE